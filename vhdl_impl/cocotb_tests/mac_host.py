@@ -0,0 +1,280 @@
+from collections import deque, namedtuple
+import numpy as np
+
+#GENERICS (must match TopModule)
+DATA_WIDTH = 8
+LENGTH     = 4
+MEM_DEPTH  = 4
+MEM_WIDTH  = 32
+
+# Instructions (dut.i_instructions)
+INS_NULL   = 0b00
+INS_READ   = 0b01
+INS_WRITE  = 0b10
+INS_COMPUTE= 0b11
+
+# Register Address and Mapping
+ADDR_STATUS = 0
+ADDR_VEC_A  = 1
+ADDR_VEC_B  = 2
+ADDR_RESULT = 3
+
+# Streaming TopModule timing (one instruction per bus cycle):
+# COMPUTE sampled at edge c -> start at c+1 -> 3 MAC stages -> MemReg(3) written at edge c+4,
+# so a READ of RESULT issued in cycle c+5 returns the result of that compute.
+# Operands are sampled by the MAC at edge c+1, so VEC_A/VEC_B may be rewritten right after COMPUTE.
+RESULT_LATENCY = 5
+
+# macs/macs_per_cycle count what the MAC unit executed (LENGTH lanes per COMPUTE, padding included),
+# useful_macs is the size of the offloaded layer (M*N*K)
+OffloadReport = namedtuple("OffloadReport", ["macs", "useful_macs", "bus_cycles", "computes", "writes", "writes_skipped", "macs_per_cycle"])
+
+def int_to_signed(value, width):
+    if value < 0:
+        value = (1 << width) + value
+    return value & ((1 << width) - 1)
+
+def signed_to_int(value, width):
+    if hasattr(value, '__int__'):
+        value = int(value)
+    if value >= (1 << (width - 1)):
+        value = value - (1 << width)
+    return value
+
+#converts 4x8-bits into a 32-bit word
+def pack_vector(values):
+    packed = 0
+    for i,val in enumerate(values):
+        byte_val = int_to_signed(int(val),DATA_WIDTH)
+        packed |= (byte_val << (i*8))
+    return packed
+
+def _as_int8(name, values):
+    arr = np.asarray(values)
+    if not np.issubdtype(arr.dtype, np.integer):
+        raise ValueError(f"{name} must be an integer array, got dtype {arr.dtype}")
+    if arr.size and (arr.min() < -(1 << (DATA_WIDTH-1)) or arr.max() >= (1 << (DATA_WIDTH-1))):
+        raise ValueError(f"{name} has values outside the signed INT{DATA_WIDTH} range")
+    return arr.astype(np.int64)
+
+# splits every row into LENGTH-wide chunks (zero padded) and packs each chunk into a register word
+def _pack_rows(rows):
+    n_rows, depth = rows.shape
+    n_chunks = max(1, -(-depth // LENGTH))
+    padded = np.zeros((n_rows, n_chunks * LENGTH), dtype=np.int64)
+    padded[:, :depth] = rows
+    chunks = padded.reshape(n_rows, n_chunks, LENGTH)
+    return [[pack_vector(chunks[r, c]) for c in range(n_chunks)] for r in range(n_rows)]
+
+# A bus schedule: one (instruction, address, wr_data) tuple per bus cycle plus the
+# bookkeeping needed to fold the RESULT reads back into the output matrix.
+class Schedule:
+    def __init__(self, out_shape, useful_macs):
+        self.out_shape = out_shape
+        self.useful_macs = useful_macs
+        self.slots = []
+        self.read_tags = []     # compute index returned by each READ slot, in order
+        self.targets = []       # (flat output index, compute index), one per dot product tile
+        self.computes = 0
+        self.writes = 0
+        self.writes_skipped = 0
+        self.layout = lambda out: out
+
+    def gather(self, reads):
+        if len(reads) != len(self.read_tags):
+            raise ValueError(f"Expected {len(self.read_tags)} reads, got {len(reads)}")
+        partial = [0] * self.computes
+        for tag, raw in zip(self.read_tags, reads):
+            partial[tag] = signed_to_int(raw, MEM_WIDTH)
+        out = np.zeros(self.out_shape, dtype=np.int64)
+        for index, tag in self.targets:
+            out.flat[index] += partial[tag]
+        return self.layout(out), self.report()
+
+    def report(self):
+        cycles = len(self.slots)
+        macs = self.computes * LENGTH
+        return OffloadReport(macs, self.useful_macs, cycles, self.computes, self.writes, self.writes_skipped,
+                             macs / cycles if cycles else 0.0)
+
+# Turns (vecA word, vecB word, output index) tiles into bus cycles.
+# - VEC_A/VEC_B are only written when the word differs from what the register already holds
+# - tiles with an all-zero operand are skipped, repeated operand pairs reuse the earlier result
+# - the operand writes of the next tile are issued while the previous compute is in the pipeline,
+#   and each RESULT read is placed exactly RESULT_LATENCY cycles after its COMPUTE
+def _schedule(tiles, out_shape, useful_macs):
+    sched = Schedule(out_shape, useful_macs)
+    pending = deque()   # (due cycle, compute index)
+    regs = {ADDR_VEC_A: None, ADDR_VEC_B: None}
+    seen = {}
+
+    def issue_reads():
+        while pending and pending[0][0] == len(sched.slots):
+            _, tag = pending.popleft()
+            sched.slots.append((INS_READ, ADDR_RESULT, 0))
+            sched.read_tags.append(tag)
+
+    def emit(slot):
+        issue_reads()
+        sched.slots.append(slot)
+
+    for word_a, word_b, index in tiles:
+        if word_a == 0 or word_b == 0:
+            continue
+        if (word_a, word_b) in seen:
+            sched.targets.append((index, seen[(word_a, word_b)]))
+            continue
+        for address, word in ((ADDR_VEC_A, word_a), (ADDR_VEC_B, word_b)):
+            if regs[address] == word:
+                sched.writes_skipped += 1
+                continue
+            emit((INS_WRITE, address, word))
+            regs[address] = word
+            sched.writes += 1
+        emit((INS_COMPUTE, 0, 0))
+        tag = sched.computes
+        sched.computes += 1
+        pending.append((len(sched.slots) - 1 + RESULT_LATENCY, tag))
+        seen[(word_a, word_b)] = tag
+        sched.targets.append((index, tag))
+
+    # drain the pipeline
+    while pending:
+        issue_reads()
+        if pending:
+            sched.slots.append((INS_NULL, 0, 0))
+    return sched
+
+# C = A @ B with A (M x K) and B (K x N), both signed INT8
+def plan_gemm(A, B):
+    A = _as_int8("A", A)
+    B = _as_int8("B", B)
+    if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0]:
+        raise ValueError(f"Shape mismatch {A.shape} @ {B.shape}")
+    M, K = A.shape
+    N = B.shape[1]
+    words_a = _pack_rows(A)
+    words_b = _pack_rows(B.T)
+
+    # K chunks outermost, VEC_A stays resident across a row of C and the columns of C are walked
+    # in a serpentine order, so the last VEC_B of one row is also the first VEC_B of the next one
+    tiles = []
+    for c in range(len(words_a[0]) if M else 0):
+        for m in range(M):
+            cols = range(N) if m % 2 == 0 else reversed(range(N))
+            for n in cols:
+                tiles.append((words_a[m][c], words_b[n][c], m * N + n))
+    return _schedule(tiles, (M, N), M * N * K)
+
+# y = x (*) w, 'valid' 1D cross-correlation as used by conv layers.
+# w is a single kernel (K,) giving y (L-K+1,) or a bank of filters (F, K) giving y (F, L-K+1).
+def plan_conv1d(x, w):
+    x = _as_int8("x", x)
+    w = _as_int8("w", w)
+    if x.ndim != 1 or w.ndim not in (1, 2):
+        raise ValueError("x must be 1D and w must be 1D or 2D")
+    if w.shape[-1] == 0:
+        raise ValueError("Kernel length 0 does not fit any input")
+    filters = w.reshape(-1, w.shape[-1])
+    K = filters.shape[1]
+    if not 0 < K <= x.shape[0]:
+        raise ValueError(f"Kernel length {K} does not fit input length {x.shape[0]}")
+    windows = np.lib.stride_tricks.sliding_window_view(x, K)
+    # im2col: every output position is one row of A, the filters are the columns of B (weight stationary)
+    sched = plan_gemm(windows, filters.T)
+    if w.ndim == 1:
+        sched.layout = lambda out: out[:, 0]
+    else:
+        sched.layout = lambda out: out.T
+    return sched
+
+# Cycle model of the streaming TopModule (register_map.vhd), one call to step() per rising edge of i_clk
+class SoftwareBackend:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.mem = [0] * MEM_DEPTH
+        self.rd_data = 0
+        self.start = 0
+        self.running = False
+        self.pipe_busy = 0
+        self.stages = [None, None, None]
+
+    def _dot(self):
+        vecA = [signed_to_int((self.mem[ADDR_VEC_A] >> (8*i)) & 0xFF, DATA_WIDTH) for i in range(LENGTH)]
+        vecB = [signed_to_int((self.mem[ADDR_VEC_B] >> (8*i)) & 0xFF, DATA_WIDTH) for i in range(LENGTH)]
+        return sum(a * b for a, b in zip(vecA, vecB))
+
+    def step(self, instruction, address=0, wr_data=0):
+        mem = list(self.mem)
+        valid = self.stages[2]
+        # proc_mem
+        if instruction == INS_WRITE and address not in (ADDR_STATUS, ADDR_RESULT):
+            mem[address] = wr_data & ((1 << MEM_WIDTH) - 1)
+        if instruction == INS_READ:
+            self.rd_data = self.mem[address]
+        if valid is not None:
+            mem[ADDR_RESULT] = int_to_signed(valid, MEM_WIDTH)
+        mem[ADDR_STATUS] = int(self.running) | (int(valid is not None) << 1) | (self.pipe_busy << 2)
+        # mac_unit
+        self.stages = [self._dot() if self.start else None, self.stages[0], self.stages[1]]
+        # proc_control
+        start = self.start
+        if instruction == INS_COMPUTE:
+            self.start = 1
+            self.running = True
+        else:
+            self.start = 0
+            if self.running and self.pipe_busy == 0b100:
+                self.running = False
+        self.pipe_busy = ((self.pipe_busy << 1) | start) & 0b111
+        self.mem = mem
+        return self.rd_data
+
+    def run(self, schedule):
+        reads = []
+        for instruction, address, wr_data in schedule.slots:
+            rd_data = self.step(instruction, address, wr_data)
+            if instruction == INS_READ:
+                reads.append(rd_data)
+        return reads
+
+# Drives the schedule onto the cocotb TopModule DUT, one instruction per i_clk cycle.
+# The DUT clock must already be running and the DUT out of reset.
+class CocotbBackend:
+    def __init__(self, dut):
+        self.dut = dut
+
+    async def run(self, schedule):
+        from cocotb.triggers import FallingEdge, RisingEdge, ReadOnly
+        dut = self.dut
+        reads = []
+        for instruction, address, wr_data in schedule.slots:
+            await FallingEdge(dut.i_clk)
+            dut.i_instruction.value = instruction
+            dut.i_address.value = address
+            dut.i_wr_data.value = wr_data
+            await RisingEdge(dut.i_clk)
+            await ReadOnly()
+            if instruction == INS_READ:
+                reads.append(int(dut.o_rd_data.value))
+        await FallingEdge(dut.i_clk)
+        dut.i_instruction.value = INS_NULL
+        return reads
+
+def gemm(A, B, backend=None):
+    sched = plan_gemm(A, B)
+    return sched.gather((backend or SoftwareBackend()).run(sched))
+
+def conv1d(x, w, backend=None):
+    sched = plan_conv1d(x, w)
+    return sched.gather((backend or SoftwareBackend()).run(sched))
+
+async def gemm_on_dut(dut, A, B):
+    sched = plan_gemm(A, B)
+    return sched.gather(await CocotbBackend(dut).run(sched))
+
+async def conv1d_on_dut(dut, x, w):
+    sched = plan_conv1d(x, w)
+    return sched.gather(await CocotbBackend(dut).run(sched))
@@ -0,0 +1,92 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+import numpy as np
+
+from mac_host import (LENGTH, INS_NULL, plan_gemm, plan_conv1d, SoftwareBackend, CocotbBackend,
+                      gemm_on_dut, conv1d_on_dut)
+
+async def setup_dut(dut):
+    clock = Clock(dut.i_clk, 10, unit="ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_nrst.value = 0
+    dut.i_instruction.value = INS_NULL
+    dut.i_address.value = 0
+    dut.i_wr_data.value = 0
+    await ClockCycles(dut.i_clk, 5)
+    dut.i_nrst.value = 1
+    await ClockCycles(dut.i_clk, 3)
+
+# tiled matrix multiply on the DUT against numpy
+@cocotb.test()
+async def test_gemm_offload(dut):
+    await setup_dut(dut)
+    rng = np.random.default_rng(123)
+
+    shapes = [(1, 4, 1), (3, 5, 4), (6, 16, 6), (4, 9, 1)]
+    for M, K, N in shapes:
+        A = rng.integers(-128, 128, (M, K))
+        B = rng.integers(-128, 128, (K, N))
+        C, report = await gemm_on_dut(dut, A, B)
+        assert (C == A @ B).all(), f"GEMM {M}x{K}x{N}: Expected\n{A @ B}\ngot\n{C}"
+        assert report.macs_per_cycle <= LENGTH, f"GEMM {M}x{K}x{N}: {report.macs_per_cycle} MACs/cycle exceeds {LENGTH} lanes"
+        cocotb.log.info(f"GEMM {M}x{K}x{N}: {report.macs} MACs in {report.bus_cycles} bus cycles "
+                        f"({report.macs_per_cycle:.3f} MACs/cycle, {report.writes_skipped} writes skipped)")
+
+    # boundary values
+    A = np.full((2, 4), -128)
+    B = np.full((4, 3), -128)
+    C, _ = await gemm_on_dut(dut, A, B)
+    assert (C == A @ B).all(), f"Boundary GEMM: Expected {A @ B}, got {C}"
+
+    cocotb.log.info("Tiled GEMM offload matches numpy")
+
+# the serpentine 3x4x4 schedule with skipped operand writes on the DUT
+@cocotb.test()
+async def test_operand_reuse(dut):
+    await setup_dut(dut)
+
+    A = np.arange(1, 13).reshape(3, 4)
+    B = np.arange(-8, 8).reshape(4, 4)
+    C, report = await gemm_on_dut(dut, A, B)
+    assert (C == A @ B).all(), f"Reuse GEMM: Expected\n{A @ B}\ngot\n{C}"
+    assert report.writes_skipped > 0, f"Expected skipped operand writes, got {report}"
+
+    cocotb.log.info("Schedule with skipped operand writes matches numpy on the DUT")
+
+# 1D convolution (single kernel and filter bank) on the DUT against numpy
+@cocotb.test()
+async def test_conv1d_offload(dut):
+    await setup_dut(dut)
+    rng = np.random.default_rng(7)
+
+    x = rng.integers(-128, 128, 40)
+    w = rng.integers(-128, 128, 3)
+    y, report = await conv1d_on_dut(dut, x, w)
+    expected = np.correlate(x, w, "valid")
+    assert (y == expected).all(), f"Conv1d: Expected {expected}, got {y}"
+    cocotb.log.info(f"Conv1d K=3: {report.macs_per_cycle:.3f} MACs/cycle")
+
+    W = rng.integers(-128, 128, (3, 7))
+    y, report = await conv1d_on_dut(dut, x, W)
+    expected = np.stack([np.correlate(x, f, "valid") for f in W])
+    assert (y == expected).all(), f"Conv1d bank: Expected {expected}, got {y}"
+    cocotb.log.info(f"Conv1d 3x7 bank: {report.macs_per_cycle:.3f} MACs/cycle")
+
+    cocotb.log.info("Tiled conv1d offload matches numpy")
+
+# the software backend must return exactly what the RTL returns for the same schedule
+@cocotb.test()
+async def test_software_backend_matches_dut(dut):
+    await setup_dut(dut)
+    rng = np.random.default_rng(99)
+
+    schedules = [plan_gemm(rng.integers(-128, 128, (5, 6)), rng.integers(-128, 128, (6, 3))),
+                 plan_conv1d(rng.integers(-128, 128, 20), rng.integers(-128, 128, 5))]
+    for sched in schedules:
+        hw_reads = await CocotbBackend(dut).run(sched)
+        sw_reads = SoftwareBackend().run(sched)
+        assert hw_reads == sw_reads, f"DUT reads {hw_reads} differ from software model {sw_reads}"
+
+    cocotb.log.info("Software backend is cycle accurate against the DUT")
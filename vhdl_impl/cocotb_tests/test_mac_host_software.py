@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from mac_host import (LENGTH, INS_WRITE, ADDR_VEC_B, plan_gemm, plan_conv1d, gemm, conv1d, SoftwareBackend)
+
+# every WRITE in the schedule must change the word its register holds
+def assert_no_redundant_writes(sched):
+    regs = {}
+    for cycle, (instruction, address, data) in enumerate(sched.slots):
+        if instruction == INS_WRITE:
+            assert regs.get(address) != data, f"Cycle {cycle}: rewrites 0x{data:08x} already held at address {address}"
+            regs[address] = data
+
+# tiled matrix multiply on the software backend against numpy
+@pytest.mark.parametrize("M, K, N", [(1, 4, 1), (3, 5, 4), (6, 16, 6), (4, 9, 1), (8, 16, 8)])
+def test_gemm_software(M, K, N):
+    rng = np.random.default_rng(123)
+    A = rng.integers(-128, 128, (M, K))
+    B = rng.integers(-128, 128, (K, N))
+    assert_no_redundant_writes(plan_gemm(A, B))
+    C, report = gemm(A, B)
+    assert (C == A @ B).all(), f"GEMM {M}x{K}x{N}: Expected\n{A @ B}\ngot\n{C}"
+    assert report.macs_per_cycle <= LENGTH, f"GEMM {M}x{K}x{N}: {report.macs_per_cycle} MACs/cycle exceeds {LENGTH} lanes"
+
+def test_gemm_boundary_values():
+    A = np.full((2, 4), -128)
+    B = np.full((4, 3), -128)
+    C, _ = gemm(A, B)
+    assert (C == A @ B).all(), f"Boundary GEMM: Expected {A @ B}, got {C}"
+
+# 1D convolution (single kernel and filter bank) on the software backend against numpy
+def test_conv1d_software():
+    rng = np.random.default_rng(7)
+    x = rng.integers(-128, 128, 40)
+
+    w = rng.integers(-128, 128, 3)
+    y, _ = conv1d(x, w)
+    expected = np.correlate(x, w, "valid")
+    assert (y == expected).all(), f"Conv1d: Expected {expected}, got {y}"
+
+    W = rng.integers(-128, 128, (3, 7))
+    y, _ = conv1d(x, W)
+    expected = np.stack([np.correlate(x, f, "valid") for f in W])
+    assert (y == expected).all(), f"Conv1d bank: Expected {expected}, got {y}"
+
+# 3x4x4, one K chunk, all words distinct and nonzero: VEC_A is written once per row of C and
+# the serpentine column order saves one VEC_B write per row -> 3 + 4 + 2*3 writes for 12 computes
+def test_operand_reuse_counts():
+    sched = plan_gemm(np.arange(1, 13).reshape(3, 4), np.arange(-8, 8).reshape(4, 4))
+    assert_no_redundant_writes(sched)
+    report = sched.report()
+    assert report.computes == 12, f"Expected 12 computes, got {report.computes}"
+    assert report.writes == 13, f"Expected 13 writes, got {report.writes}"
+    assert report.writes_skipped == 11, f"Expected 11 skipped writes, got {report.writes_skipped}"
+
+# weight stationary conv1d: the kernel is written once, then only VEC_A changes
+def test_conv1d_kernel_written_once():
+    sched = plan_conv1d(np.arange(-10, 10), np.array([3, -1, 2]))
+    assert_no_redundant_writes(sched)
+    vec_b_writes = sum(1 for ins, addr, _ in sched.slots if ins == INS_WRITE and addr == ADDR_VEC_B)
+    assert vec_b_writes == 1, f"Expected the kernel to be written once, got {vec_b_writes} VEC_B writes"
+
+# sparse input: zero tiles are skipped, the reported rate counts executed MACs only
+def test_sparse_report():
+    A = np.zeros((4, 8), dtype=np.int64)
+    A[1, 3] = 5
+    B = np.ones((8, 4), dtype=np.int64)
+    C, report = gemm(A, B)
+    assert (C == A @ B).all(), f"Sparse GEMM: Expected\n{A @ B}\ngot\n{C}"
+    assert report.computes == 1 and report.macs == LENGTH, f"Expected a single compute, got {report}"
+    assert report.useful_macs == 4 * 8 * 4, f"Expected 128 useful MACs, got {report.useful_macs}"
+    assert report.macs_per_cycle <= LENGTH, f"{report.macs_per_cycle} MACs/cycle exceeds {LENGTH} lanes"
+
+@pytest.mark.parametrize("args", [
+    (np.ones((2, 3)), np.ones((3, 2))),                      # not integer
+    (np.array([[200]]), np.array([[1]])),                    # outside INT8
+    (np.ones((2, 3), dtype=int), np.ones((4, 2), dtype=int)) # shape mismatch
+])
+def test_gemm_rejects_bad_input(args):
+    with pytest.raises(ValueError):
+        plan_gemm(*args)
+
+@pytest.mark.parametrize("w", [np.zeros(0, dtype=int), np.zeros((2, 0), dtype=int), np.ones(9, dtype=int)])
+def test_conv1d_rejects_bad_kernel(w):
+    with pytest.raises(ValueError):
+        plan_conv1d(np.ones(8, dtype=int), w)
+
+def test_gather_rejects_missing_reads():
+    sched = plan_gemm(np.ones((2, 4), dtype=int), np.ones((4, 2), dtype=int))
+    reads = SoftwareBackend().run(sched)
+    with pytest.raises(ValueError):
+        sched.gather(reads[:-1])
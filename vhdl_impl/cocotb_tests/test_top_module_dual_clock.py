@@ -0,0 +1,260 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, ClockCycles
+from collections import deque
+import random
+
+from mac_host import (LENGTH, MEM_WIDTH, INS_NULL, INS_READ, INS_COMPUTE,
+                      ADDR_STATUS, ADDR_VEC_A, ADDR_VEC_B, ADDR_RESULT, pack_vector, signed_to_int)
+from test_top_module import write_register
+
+FIFO_DEPTH = 8
+BUS_PERIOD_PS = 10000
+
+# STATUS bits of TopModuleDualClock
+ST_RUNNING = 0b1
+ST_VALID   = 0b10
+ST_FULL    = 0b100000
+ST_OVERFLOW= 0b1000000
+
+# Unlike test_top_module.read_register, READ is only held for one edge: reading RESULT pops the
+# result FIFO and reading STATUS clears the overflow bit, so a second READ edge would consume twice
+async def read_register(dut,address):
+    dut.i_instruction.value = INS_READ
+    dut.i_address.value = address
+    await RisingEdge(dut.i_clk)
+    dut.i_instruction.value = INS_NULL
+    await RisingEdge(dut.i_clk)
+    result = int(dut.o_rd_data.value)
+    return result
+
+async def compute(dut):
+    dut.i_instruction.value = INS_COMPUTE
+    await RisingEdge(dut.i_clk)
+    dut.i_instruction.value = INS_NULL
+
+# after i_nrst is released the bus domain waits up to 2 i_mac_clk periods + 2 i_clk cycles for the
+# MAC domain reset, plus one i_clk cycle for the phase between the clocks
+def reset_release_cycles(mac_period_ps):
+    return -(-2 * mac_period_ps // BUS_PERIOD_PS) + 2 + 1
+
+async def setup_dut(dut, mac_period_ps):
+    cocotb.start_soon(Clock(dut.i_clk, BUS_PERIOD_PS, unit="ps").start())
+    cocotb.start_soon(Clock(dut.i_mac_clk, mac_period_ps, unit="ps").start())
+
+    dut.i_nrst.value = 0
+    dut.i_instruction.value = INS_NULL
+    dut.i_address.value = 0
+    dut.i_wr_data.value = 0
+    await ClockCycles(dut.i_clk, 5)
+    dut.i_nrst.value = 1
+    await ClockCycles(dut.i_clk, reset_release_cycles(mac_period_ps))
+
+# pops one result, waiting for it to cross over from the MAC domain
+async def pop_result(dut, timeout_cycles=100):
+    timeout = timeout_cycles
+    while timeout > 0:
+        status = await read_register(dut, ADDR_STATUS)
+        if status & ST_VALID:
+            return signed_to_int(await read_register(dut, ADDR_RESULT), MEM_WIDTH)
+        timeout -= 1
+    assert False, "Timeout waiting for valid"
+
+# waits until every result has been read and nothing is left in flight
+async def expect_drained(dut, settle_cycles=50):
+    await ClockCycles(dut.i_clk, settle_cycles)
+    status = await read_register(dut, ADDR_STATUS)
+    assert status == 0, f"Expected idle STATUS after draining, got 0x{status:08x}"
+
+# random stream of computes with results read back in between, checked in order for loss/duplication
+async def run_stream(dut, mac_period_ps, seed, num_ops=60):
+    await setup_dut(dut, mac_period_ps)
+    rng = random.Random(seed)
+    expected = deque()
+    got = 0
+
+    for i in range(num_ops):
+        vecA = [rng.randint(-128, 127) for _ in range(LENGTH)]
+        vecB = [rng.randint(-128, 127) for _ in range(LENGTH)]
+        await write_register(dut, ADDR_VEC_A, pack_vector(vecA))
+        await write_register(dut, ADDR_VEC_B, pack_vector(vecB))
+
+        status = await read_register(dut, ADDR_STATUS)
+        while status & ST_FULL:
+            result = await pop_result(dut)
+            assert result == expected.popleft(), f"Result {got}: wrong value {result}"
+            got += 1
+            status = await read_register(dut, ADDR_STATUS)
+        await compute(dut)
+        expected.append(sum(a * b for a, b in zip(vecA, vecB)))
+
+        # read back at random points so the FIFOs run both nearly empty and full
+        if rng.random() < 0.3:
+            while expected and rng.random() < 0.7:
+                result = await pop_result(dut)
+                exp = expected.popleft()
+                assert result == exp, f"Result {got}: Expected {exp}, got {result}"
+                got += 1
+
+    while expected:
+        result = await pop_result(dut)
+        exp = expected.popleft()
+        assert result == exp, f"Result {got}: Expected {exp}, got {result}"
+        got += 1
+
+    assert got == num_ops, f"Expected {num_ops} results, got {got}"
+    await expect_drained(dut)
+    cocotb.log.info(f"MAC period {mac_period_ps} ps: {num_ops} results, no loss or duplication")
+
+# MAC clock ~3x faster than the bus
+@cocotb.test()
+async def test_stream_fast_mac(dut):
+    await run_stream(dut, 3300, seed=1)
+
+# MAC clock slightly faster than the bus, with beating phase
+@cocotb.test()
+async def test_stream_near_ratio(dut):
+    await run_stream(dut, 7100, seed=2)
+
+# MAC clock slower than the bus
+@cocotb.test()
+async def test_stream_slow_mac(dut):
+    await run_stream(dut, 23700, seed=3)
+
+# back to back COMPUTEs: the first FIFO_DEPTH are accepted, the rest are ignored and flagged as overflow
+@cocotb.test()
+async def test_burst_and_full(dut):
+    await setup_dut(dut, 4700)
+
+    vecA = [3, -4, 5, -6]
+    vecB = [7, 8, -9, 10]
+    await write_register(dut, ADDR_VEC_A, pack_vector(vecA))
+    await write_register(dut, ADDR_VEC_B, pack_vector(vecB))
+    expected = sum(a * b for a, b in zip(vecA, vecB))
+
+    dut.i_instruction.value = INS_COMPUTE
+    await ClockCycles(dut.i_clk, FIFO_DEPTH + 4)
+    dut.i_instruction.value = INS_NULL
+    await RisingEdge(dut.i_clk)
+
+    status = await read_register(dut, ADDR_STATUS)
+    assert status & ST_FULL, f"Expected full bit after burst, got 0x{status:08x}"
+    assert status & ST_OVERFLOW, f"Expected overflow bit for the dropped COMPUTEs, got 0x{status:08x}"
+    status = await read_register(dut, ADDR_STATUS)
+    assert (status & ST_OVERFLOW) == 0, f"Overflow bit should clear on STATUS read, got 0x{status:08x}"
+
+    for i in range(FIFO_DEPTH):
+        result = await pop_result(dut)
+        assert result == expected, f"Result {i}: Expected {expected}, got {result}"
+
+    status = await read_register(dut, ADDR_STATUS)
+    assert (status & (ST_VALID | ST_RUNNING | ST_FULL)) == 0, f"Extra results after burst, STATUS 0x{status:08x}"
+
+    # one COMPUTE past the limit sets the sticky bit again, reset clears it
+    dut.i_instruction.value = INS_COMPUTE
+    await ClockCycles(dut.i_clk, FIFO_DEPTH + 1)
+    dut.i_instruction.value = INS_NULL
+    await RisingEdge(dut.i_clk)
+    dut.i_nrst.value = 0
+    await RisingEdge(dut.i_clk)
+    dut.i_nrst.value = 1
+    await ClockCycles(dut.i_clk, reset_release_cycles(4700))
+    status = await read_register(dut, ADDR_STATUS)
+    assert status == 0, f"Reset should clear overflow and pending results, got 0x{status:08x}"
+    await write_register(dut, ADDR_VEC_A, pack_vector(vecA))
+    await write_register(dut, ADDR_VEC_B, pack_vector(vecB))
+    await compute(dut)
+    result = await pop_result(dut)
+    assert result == expected, f"Expected {expected} after reset, got {result}"
+
+    # RESULT keeps the last value once the FIFO is empty
+    result = signed_to_int(await read_register(dut, ADDR_RESULT), MEM_WIDTH)
+    assert result == expected, f"RESULT should hold the last value {expected}, got {result}"
+    await expect_drained(dut)
+
+    cocotb.log.info(f"Burst accepted exactly {FIFO_DEPTH} computes and flagged the rest")
+
+# operands are captured at COMPUTE, rewriting them right after must not change the result
+@cocotb.test()
+async def test_operand_capture(dut):
+    await setup_dut(dut, 13100)
+
+    cases = [([1, 2, 3, 4], [5, 6, 7, 8]),
+             ([-128, -128, 127, 127], [-128, 127, -128, 127]),
+             ([0, 0, 0, 1], [9, 9, 9, -9])]
+    for vecA, vecB in cases:
+        await write_register(dut, ADDR_VEC_A, pack_vector(vecA))
+        await write_register(dut, ADDR_VEC_B, pack_vector(vecB))
+        await compute(dut)
+
+    for vecA, vecB in cases:
+        expected = sum(a * b for a, b in zip(vecA, vecB))
+        result = await pop_result(dut)
+        assert result == expected, f"{vecA}.{vecB}: Expected {expected}, got {result}"
+
+    await expect_drained(dut)
+    cocotb.log.info("Operands are captured at COMPUTE time")
+
+# reset with computations in flight clears both domains
+@cocotb.test()
+async def test_reset_in_flight(dut):
+    await setup_dut(dut, 6100)
+
+    await write_register(dut, ADDR_VEC_A, pack_vector([10, 20, 30, 40]))
+    await write_register(dut, ADDR_VEC_B, pack_vector([5, 5, 5, 5]))
+    for _ in range(4):
+        await compute(dut)
+
+    dut.i_nrst.value = 0
+    await ClockCycles(dut.i_clk, 3)
+    dut.i_nrst.value = 1
+    await ClockCycles(dut.i_clk, reset_release_cycles(6100))
+
+    await expect_drained(dut)
+    result = await read_register(dut, ADDR_RESULT)
+    assert result == 0, f"Result should be 0 after reset, got 0x{result:08x}"
+
+    await write_register(dut, ADDR_VEC_A, pack_vector([1, 2, 3, 4]))
+    await write_register(dut, ADDR_VEC_B, pack_vector([1, 1, 1, 1]))
+    await compute(dut)
+    result = await pop_result(dut)
+    assert result == 10, f"Expected 10 after reset, got {result}"
+    await expect_drained(dut)
+
+    cocotb.log.info("Reset during computation clears both clock domains")
+
+# one cycle reset pulse with a slow MAC clock: the bus domain must not see stale MAC domain pointers
+@cocotb.test()
+async def test_short_reset_slow_mac(dut):
+    mac_period_ps = 23700
+    await setup_dut(dut, mac_period_ps)
+
+    await write_register(dut, ADDR_VEC_A, pack_vector([7, 7, 7, 7]))
+    await write_register(dut, ADDR_VEC_B, pack_vector([-3, 2, -3, 2]))
+    for _ in range(3):
+        await compute(dut)
+    # let the results land in the result FIFO unread
+    await ClockCycles(dut.i_clk, 40)
+    status = await read_register(dut, ADDR_STATUS)
+    assert status & ST_VALID, f"Expected pending results before reset, got 0x{status:08x}"
+
+    dut.i_nrst.value = 0
+    await RisingEdge(dut.i_clk)
+    dut.i_nrst.value = 1
+
+    # neither STATUS nor RESULT may expose pre-reset state while the MAC domain leaves reset
+    for i in range(reset_release_cycles(mac_period_ps) + 10):
+        status = await read_register(dut, ADDR_STATUS)
+        result = await read_register(dut, ADDR_RESULT)
+        assert status == 0, f"Read {i}: STATUS should be 0 after reset, got 0x{status:08x}"
+        assert result == 0, f"Read {i}: RESULT should be 0 after reset, got 0x{result:08x}"
+
+    await expect_drained(dut)
+    await write_register(dut, ADDR_VEC_A, pack_vector([1, 2, 3, 4]))
+    await write_register(dut, ADDR_VEC_B, pack_vector([2, 2, 2, 2]))
+    await compute(dut)
+    result = await pop_result(dut)
+    assert result == 20, f"Expected 20 after reset, got {result}"
+    await expect_drained(dut)
+
+    cocotb.log.info("Short reset pulse with a slow MAC clock leaves no stale results")
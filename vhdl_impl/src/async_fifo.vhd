@@ -0,0 +1,125 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+library work;
+use work.TaskGlobalPackage.all;
+
+-- Dual-clock first-word-fall-through FIFO.
+-- Read and write pointers cross the clock domains as gray code through two-flop synchronizers,
+-- so full/empty are conservative (full may release and empty may clear a few cycles late) but never wrong.
+-- Writing while full is a design error and stops the simulation.
+-- Timing: the gray pointers and the fifo_mem read path cross clocks and need a -datapath_only max delay
+-- of one period of the faster clock (not a clock group false path), see the README.
+entity async_fifo is
+    generic(
+        DATA_WIDTH : natural := 32;
+        DEPTH      : natural := 8 -- power of 2, at least 2
+    );
+    port(
+        -- write domain
+        i_wr_clk    : in std_ulogic;
+        i_wr_nrst   : in std_ulogic;
+        i_wr_en     : in std_ulogic;
+        i_wr_data   : in std_ulogic_vector(DATA_WIDTH-1 downto 0);
+        o_full      : out std_ulogic;
+        -- read domain
+        i_rd_clk    : in std_ulogic;
+        i_rd_nrst   : in std_ulogic;
+        i_rd_en     : in std_ulogic;
+        o_rd_data   : out std_ulogic_vector(DATA_WIDTH-1 downto 0);
+        o_empty     : out std_ulogic;
+        o_rd_level  : out unsigned(ceil_log2(DEPTH) downto 0)
+    );
+end entity async_fifo;
+
+architecture RTL of async_fifo is
+    constant ADDR_W : natural := ceil_log2(DEPTH);
+
+    type tFifoMem is array(0 to DEPTH-1) of std_ulogic_vector(DATA_WIDTH-1 downto 0);
+    signal fifo_mem : tFifoMem := (others => (others => '0'));
+
+    signal wr_bin, wr_gray : unsigned(ADDR_W downto 0) := (others => '0');
+    signal rd_bin, rd_gray : unsigned(ADDR_W downto 0) := (others => '0');
+    -- gray pointers synchronized into the opposite domain
+    signal rd_gray_meta, rd_gray_sync : unsigned(ADDR_W downto 0) := (others => '0');
+    signal wr_gray_meta, wr_gray_sync : unsigned(ADDR_W downto 0) := (others => '0');
+
+    attribute ASYNC_REG : string;
+    attribute ASYNC_REG of rd_gray_meta, rd_gray_sync : signal is "TRUE";
+    attribute ASYNC_REG of wr_gray_meta, wr_gray_sync : signal is "TRUE";
+
+    signal wr_level : unsigned(ADDR_W downto 0) := (others => '0');
+    signal full  : std_ulogic := '0';
+    signal empty : std_ulogic := '1';
+
+    function bin2gray(Arg : unsigned) return unsigned is
+    begin
+        return Arg xor shift_right(Arg, 1);
+    end function;
+
+    function gray2bin(Arg : unsigned) return unsigned is
+        variable r : unsigned(Arg'range);
+    begin
+        r(Arg'high) := Arg(Arg'high);
+        for i in Arg'high-1 downto Arg'low loop
+            r(i) := r(i+1) xor Arg(i);
+        end loop;
+        return r;
+    end function;
+begin
+    assert DEPTH >= 2 and 2**ADDR_W = DEPTH
+        report "async_fifo: DEPTH must be a power of 2 and at least 2" severity failure;
+
+    -- Write Domain
+    proc_write : process(i_wr_clk)
+    begin
+        if(rising_edge(i_wr_clk)) then
+            if(i_wr_nrst = '0') then
+                wr_bin       <= (others => '0');
+                wr_gray      <= (others => '0');
+                rd_gray_meta <= (others => '0');
+                rd_gray_sync <= (others => '0');
+            else
+                rd_gray_meta <= rd_gray;
+                rd_gray_sync <= rd_gray_meta;
+                assert not (i_wr_en = '1' and full = '1')
+                    report "async_fifo: write while full, data would be lost" severity failure;
+                if(i_wr_en = '1' and full = '0') then
+                    fifo_mem(to_integer(wr_bin(ADDR_W-1 downto 0))) <= i_wr_data;
+                    wr_bin  <= wr_bin + 1;
+                    wr_gray <= bin2gray(wr_bin + 1);
+                end if;
+            end if;
+        end if;
+    end process proc_write;
+    -- occupancy seen from the write side is DEPTH exactly when the MSB of the difference is set
+    wr_level <= wr_bin - gray2bin(rd_gray_sync);
+    full <= wr_level(ADDR_W);
+
+    -- Read Domain
+    proc_read : process(i_rd_clk)
+    begin
+        if(rising_edge(i_rd_clk)) then
+            if(i_rd_nrst = '0') then
+                rd_bin       <= (others => '0');
+                rd_gray      <= (others => '0');
+                wr_gray_meta <= (others => '0');
+                wr_gray_sync <= (others => '0');
+            else
+                wr_gray_meta <= wr_gray;
+                wr_gray_sync <= wr_gray_meta;
+                if(i_rd_en = '1' and empty = '0') then
+                    rd_bin  <= rd_bin + 1;
+                    rd_gray <= bin2gray(rd_bin + 1);
+                end if;
+            end if;
+        end if;
+    end process proc_read;
+    empty <= '1' when rd_gray = wr_gray_sync else '0';
+
+    o_full     <= full;
+    o_empty    <= empty;
+    o_rd_data  <= fifo_mem(to_integer(rd_bin(ADDR_W-1 downto 0)));
+    o_rd_level <= gray2bin(wr_gray_sync) - rd_bin;
+end architecture RTL;
@@ -0,0 +1,249 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+library work;
+use work.TaskGlobalPackage.all;
+
+-- Streaming register map with the MAC unit in its own clock domain (i_mac_clk).
+-- COMPUTE captures VEC_A/VEC_B into a command FIFO, results come back through a result FIFO.
+-- Differences to TopModule:
+--   * reading RESULT pops the oldest unread result, when none is pending the last one is returned again
+--   * at most FIFO_DEPTH computations can be outstanding (issued but not read), further COMPUTEs are ignored
+--   * STATUS is built from bus domain state only:
+--       bit 0   running   : a result is still in flight in the MAC domain
+--       bit 1   valid     : an unread result is pending in RESULT
+--       bit 4:2 pipe_busy : number of results in flight (saturates at 7)
+--       bit 5   full      : FIFO_DEPTH computations outstanding or command FIFO full, COMPUTE is ignored
+--       bit 6   overflow  : sticky, a COMPUTE was ignored since STATUS was last read (cleared by the read)
+-- After i_nrst is released the bus domain stays in reset until the MAC domain has been reset too,
+-- register accesses are ignored for up to 2 i_mac_clk periods + 2 i_clk cycles.
+-- i_clk and i_mac_clk are asynchronous, see the README for the required timing constraints.
+entity TopModuleDualClock is
+    generic(
+        DATA_WIDTH : integer := 8;
+        LENGTH     : integer := 4;
+        MEM_DEPTH  : integer := 4;
+        MEM_WIDTH  : integer := 32;
+        FIFO_DEPTH : integer := 8
+    );
+    port(
+        i_clk         : in std_ulogic; -- bus clock
+        i_mac_clk     : in std_ulogic; -- MAC clock, unrelated to i_clk
+        i_nrst        : in std_ulogic; -- synchronous to i_clk
+        i_instruction : in std_ulogic_vector(1 downto 0); -- 00 Null 01 Read 10 Write 11 Compute
+        i_address     : in std_ulogic_vector(ceil_log2(MEM_DEPTH)-1 downto 0);
+        i_wr_data     : in std_ulogic_vector(MEM_WIDTH-1 downto 0);
+        o_rd_data     : out std_ulogic_vector(MEM_WIDTH-1 downto 0)
+    );
+end entity TopModuleDualClock;
+
+architecture RTL of TopModuleDualClock is
+    constant VEC_W : natural := LENGTH*DATA_WIDTH;
+    constant RES_W : natural := 2*DATA_WIDTH + ceil_log2(LENGTH);
+
+    type tMemReg is array(0 to MEM_DEPTH-1) of std_ulogic_vector(MEM_WIDTH-1 downto 0);
+    signal MemReg : tMemReg := (others => (others => '0'));
+
+    -- bus domain
+    signal bus_nrst_sync : std_ulogic_vector(1 downto 0) := (others => '0');
+    signal bus_nrst    : std_ulogic := '0';
+    signal overflow    : std_ulogic := '0';
+    signal outstanding : natural range 0 to FIFO_DEPTH := 0;
+    signal in_flight   : natural range 0 to FIFO_DEPTH := 0;
+    signal status      : std_ulogic_vector(MEM_WIDTH-1 downto 0) := (others => '0');
+    signal cmd_push    : std_ulogic := '0';
+    signal cmd_full    : std_ulogic := '0';
+    signal cmd_data    : std_ulogic_vector(2*VEC_W-1 downto 0) := (others => '0');
+    signal res_pop     : std_ulogic := '0';
+    signal res_empty   : std_ulogic := '1';
+    signal res_data    : std_ulogic_vector(RES_W-1 downto 0) := (others => '0');
+    signal res_level   : unsigned(ceil_log2(FIFO_DEPTH) downto 0) := (others => '0');
+
+    -- MAC domain
+    signal mac_nrst_sync : std_ulogic_vector(1 downto 0) := (others => '0');
+    signal mac_nrst  : std_ulogic := '0';
+    signal cmd_empty : std_ulogic := '1';
+    signal cmd_head  : std_ulogic_vector(2*VEC_W-1 downto 0) := (others => '0');
+    signal start     : std_ulogic := '0';
+    signal valid     : std_ulogic := '0';
+    signal vecA : tvector(0 to LENGTH-1)(DATA_WIDTH-1 downto 0) := (others => (others => '0'));
+    signal vecB : tvector(0 to LENGTH-1)(DATA_WIDTH-1 downto 0) := (others => (others => '0'));
+    signal result : signed(RES_W-1 downto 0) := (others => '0');
+
+    attribute ASYNC_REG : string;
+    attribute ASYNC_REG of mac_nrst_sync : signal is "TRUE";
+    attribute ASYNC_REG of bus_nrst_sync : signal is "TRUE";
+
+begin
+
+    ---------------------------------------------------------------------------
+    -- Clock Domain Crossing
+    ---------------------------------------------------------------------------
+    -- reset asserts immediately and is released synchronously to i_mac_clk
+    proc_mac_reset : process(i_mac_clk, i_nrst)
+    begin
+        if(i_nrst = '0') then
+            mac_nrst_sync <= (others => '0');
+        elsif(rising_edge(i_mac_clk)) then
+            mac_nrst_sync <= mac_nrst_sync(0) & '1';
+        end if;
+    end process proc_mac_reset;
+    mac_nrst <= mac_nrst_sync(1);
+
+    -- reset handshake: the bus domain leaves reset only once the released MAC reset has crossed back,
+    -- so both halves of each FIFO have been cleared before either side looks at the other's pointers
+    proc_bus_reset : process(i_clk)
+    begin
+        if(rising_edge(i_clk)) then
+            if(i_nrst = '0') then
+                bus_nrst_sync <= (others => '0');
+            else
+                bus_nrst_sync <= bus_nrst_sync(0) & mac_nrst;
+            end if;
+        end if;
+    end process proc_bus_reset;
+    bus_nrst <= i_nrst and bus_nrst_sync(1);
+
+    -- VEC_B & VEC_A captured at COMPUTE, bus -> MAC
+    CMD_FIFO : entity work.async_fifo(RTL)
+        generic map(
+            DATA_WIDTH => 2*VEC_W,
+            DEPTH      => FIFO_DEPTH
+        )
+        port map(
+            i_wr_clk   => i_clk,
+            i_wr_nrst  => bus_nrst,
+            i_wr_en    => cmd_push,
+            i_wr_data  => cmd_data,
+            o_full     => cmd_full,
+            i_rd_clk   => i_mac_clk,
+            i_rd_nrst  => mac_nrst,
+            i_rd_en    => start,
+            o_rd_data  => cmd_head,
+            o_empty    => cmd_empty,
+            o_rd_level => open
+        );
+
+    -- MAC results, MAC -> bus
+    RES_FIFO : entity work.async_fifo(RTL)
+        generic map(
+            DATA_WIDTH => RES_W,
+            DEPTH      => FIFO_DEPTH
+        )
+        port map(
+            i_wr_clk   => i_mac_clk,
+            i_wr_nrst  => mac_nrst,
+            i_wr_en    => valid,
+            i_wr_data  => std_ulogic_vector(result),
+            o_full     => open,
+            i_rd_clk   => i_clk,
+            i_rd_nrst  => bus_nrst,
+            i_rd_en    => res_pop,
+            o_rd_data  => res_data,
+            o_empty    => res_empty,
+            o_rd_level => res_level
+        );
+
+    ---------------------------------------------------------------------------
+    -- MAC Domain
+    ---------------------------------------------------------------------------
+    MAC_UNIT : entity work.mac_unit(RTL)
+        generic map(
+            DATA_WIDTH => DATA_WIDTH,
+            LENGTH     => LENGTH
+        )
+        port map(
+            i_clk       => i_mac_clk,
+            i_nrst_sync => mac_nrst,
+            i_start     => start,
+            i_vecA      => vecA,
+            i_vecB      => vecB,
+            o_result    => result,
+            o_valid     => valid
+        );
+
+    -- a new command is started on every i_mac_clk edge the command FIFO is not empty
+    start <= mac_nrst and not cmd_empty;
+    vectors_gen : for u in 0 to LENGTH-1 generate
+        vecA(u) <= signed(cmd_head((8*(u+1))-1 downto 8*u));
+        vecB(u) <= signed(cmd_head(VEC_W+(8*(u+1))-1 downto VEC_W+8*u));
+    end generate vectors_gen;
+
+    ---------------------------------------------------------------------------
+    -- Bus Domain
+    ---------------------------------------------------------------------------
+    -- The result FIFO holds at most 'outstanding' entries. The command FIFO's full flag can lag the
+    -- MAC domain's pops, so it is checked as well
+    cmd_push <= '1' when (bus_nrst = '1' and i_instruction = "11" and outstanding < FIFO_DEPTH and cmd_full = '0') else '0';
+    cmd_data <= MemReg(2)(VEC_W-1 downto 0) & MemReg(1)(VEC_W-1 downto 0);
+    res_pop  <= '1' when (bus_nrst = '1' and i_instruction = "01" and i_address = "11" and res_empty = '0') else '0';
+
+    -- Status from the live bus domain state, so a read never sees a result that was already popped
+    in_flight <= outstanding - to_integer(res_level);
+    proc_status : process(all)
+    begin
+        status <= (others => '0');
+        status(0) <= '1' when in_flight > 0 else '0';
+        status(1) <= not res_empty;
+        if(in_flight > 7) then
+            status(4 downto 2) <= "111";
+        else
+            status(4 downto 2) <= std_ulogic_vector(to_unsigned(in_flight, 3));
+        end if;
+        status(5) <= '1' when (outstanding = FIFO_DEPTH or cmd_full = '1') else '0';
+        status(6) <= overflow;
+    end process proc_status;
+
+    -- Handling read and write of external data
+    proc_mem : process(i_clk)
+    begin
+        if(rising_edge(i_clk)) then
+            if(bus_nrst = '0') then
+                MemReg <= (others => (others => '0'));
+                o_rd_data <= (others =>'0');
+            else
+                -- WRITE Instruction
+                if(i_instruction = "10" and (i_address /= "11" and i_address /= "00")) then
+                    MemReg(to_integer(unsigned(i_address))) <= i_wr_data;
+                end if;
+                -- READ Instruction
+                if(i_instruction = "01") then
+                    if(i_address = "00") then
+                        o_rd_data <= status;
+                    elsif(res_pop = '1') then
+                        o_rd_data <= std_ulogic_vector(resize(signed(res_data), MEM_WIDTH));
+                    else
+                        o_rd_data <= MemReg(to_integer(unsigned(i_address)));
+                    end if;
+                end if;
+                if(res_pop = '1') then
+                    MemReg(3) <= std_ulogic_vector(resize(signed(res_data), MEM_WIDTH));
+                end if;
+            end if;
+        end if;
+    end process proc_mem;
+
+    -- Control
+    proc_control : process(i_clk)
+    begin
+        if(rising_edge(i_clk)) then
+            if(bus_nrst = '0') then
+                outstanding <= 0;
+                overflow <= '0';
+            else
+                -- a dropped COMPUTE stays visible until the host reads STATUS
+                if(i_instruction = "11" and cmd_push = '0') then
+                    overflow <= '1';
+                elsif(i_instruction = "01" and i_address = "00") then
+                    overflow <= '0';
+                end if;
+                if(cmd_push = '1' and res_pop = '0') then
+                    outstanding <= outstanding + 1;
+                elsif(cmd_push = '0' and res_pop = '1') then
+                    outstanding <= outstanding - 1;
+                end if;
+            end if;
+        end if;
+    end process proc_control;
+end architecture RTL;